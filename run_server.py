@@ -6,6 +6,7 @@ import asyncio
 import sys
 import time
 import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # 프로젝트 루트를 Python 경로에 추가
@@ -14,14 +15,26 @@ sys.path.insert(0,str(project_root))
 
 # path setup
 import uvicorn
-from fastapi import FastAPI
-from src.api import llm
+from fastapi import FastAPI, Request
+from mcp.server.fastmcp import FastMCP
+from src.api import jobs, llm
+from src.compression import CompressionMiddleware
+from src.resilience import breaker_states, deadline_scope
+
+# 앱 시작/종료 시 LLM 작업 큐 워커 실행/정지
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await jobs.queue.start()
+    yield
+    await jobs.queue.stop()
 
 # FastAPi 앱 생성
-app = FastAPI(title = "API",description="API")
+app = FastAPI(title = "API",description="API", lifespan=lifespan)
 
 # Ollama API 엔드포인트 등록
 app.include_router(llm.router, prefix = "/api/v1", tags = ["llm"])
+# LLM 비동기 작업 큐 엔드포인트 등록
+app.include_router(jobs.router, prefix = "/api/v1", tags = ["llm-jobs"])
 
 @app.get("/")
 async def root():
@@ -33,6 +46,33 @@ from src.mcp_server.temp import create_temp_mcp_server
 
 from src.config import settings
 
+# 요청 단위 데드라인 (클라이언트가 X-Request-Timeout 헤더로 더 짧게 지정 가능)
+@app.middleware("http")
+async def request_deadline(request: Request, call_next):
+    budget = settings.request_timeout
+    header = request.headers.get("x-request-timeout")
+    if header:
+        try:
+            budget = min(budget, max(float(header), 0.0))
+        except ValueError:
+            pass
+
+    with deadline_scope(budget):
+        return await call_next(request)
+
+# 응답 압축 (Accept-Encoding 협상)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        compresslevel=settings.compression_level,
+    )
+
+# 업스트림 서킷 브레이커 상태 조회
+@app.get("/health/upstreams")
+async def upstream_health():
+    return breaker_states()
+
 async def main():
     """
     두 서버 동시에 실행
@@ -63,6 +103,31 @@ def run_api_server():
         log_level="info"
     )
 
+async def serve_mcp(mcp: FastMCP):
+    """
+    MCP HTTP 전송(SSE / streamable-http) 실행
+    FastMCP.run_sse_async 와 동일하지만 응답 압축 미들웨어를 적용
+    """
+    if settings.mcp_transport == "streamable-http":
+        mcp_app = mcp.streamable_http_app()
+    else:
+        mcp_app = mcp.sse_app()
+
+    if settings.compression_enabled:
+        mcp_app = CompressionMiddleware(
+            mcp_app,
+            minimum_size=settings.compression_min_size,
+            compresslevel=settings.compression_level,
+        )
+
+    config = uvicorn.Config(
+        mcp_app,
+        host=mcp.settings.host,
+        port=mcp.settings.port,
+        log_level=mcp.settings.log_level.lower(),
+    )
+    await uvicorn.Server(config).serve()
+
 async def run_mcp_servers():
     """
     MCP 서버 실행
@@ -71,13 +136,15 @@ async def run_mcp_servers():
     temp_mcp = create_temp_mcp_server()
 
     task1 = asyncio.create_task(
-        calc_mcp.run_sse_async(
+        serve_mcp(
+            calc_mcp,
             # host=settings.mcp1_host,
             # port=settings.mcp1_port
         )
     )
     task2 = asyncio.create_task(
-        temp_mcp.run_sse_async(
+        serve_mcp(
+            temp_mcp,
             #host=settings.mcp2_host,
             #port=settings.mcp2_port
         )
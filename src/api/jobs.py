@@ -0,0 +1,81 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+from typing import Optional
+
+from src.api.llm import OLLAMA_UPSTREAM, ChatRequest, generate, project_fields
+from src.config import settings
+from src.job_queue import DiskJobStore, JobQueue, JobStatus, MemoryJobStore
+from src.resilience import get_breaker
+
+
+router = APIRouter()
+
+# 저장하지 않는 Ollama 응답 필드 (대용량 토큰 배열, 클라이언트 미사용)
+DROPPED_RESULT_FIELDS = ("context",)
+
+
+async def run_prompt(prompt: str) -> dict:
+    result = await generate(prompt)
+    for field in DROPPED_RESULT_FIELDS:
+        result.pop(field, None)
+    return result
+
+
+# 작업 큐 (워커는 run_server.py 의 lifespan 에서 API 서버 이벤트 루프에 시작)
+store = DiskJobStore(settings.job_store_dir) if settings.job_store == "disk" else MemoryJobStore()
+queue = JobQueue(
+    store,
+    handler=run_prompt,
+    workers=settings.job_workers,
+    max_attempts=settings.job_max_attempts,
+    job_timeout=settings.job_timeout,
+    ttl=settings.job_ttl,
+    breaker=get_breaker(OLLAMA_UPSTREAM),
+)
+
+
+def _job_view(job) -> dict:
+    return job.model_dump(exclude={"prompt", "result", "lease_expires_at"})
+
+
+# 작업 제출: job ID 즉시 반환
+@router.post("/llm/jobs", status_code=202)
+async def submit_job(request: ChatRequest):
+    job = await queue.submit(request.prompt)
+    return _job_view(job)
+
+
+# 큐 길이 / 작업 대기 시간
+@router.get("/llm/jobs/stats")
+async def job_stats():
+    return queue.stats()
+
+
+# 작업 상태 조회 (wait > 0 이면 long-poll)
+@router.get("/llm/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = Query(default=0.0, ge=0)):
+    job = await queue.wait(job_id, min(wait, settings.job_max_wait))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_view(job)
+
+
+# 작업 결과 조회 (완료 전이면 202 + 현재 상태)
+@router.get("/llm/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    wait: float = Query(default=0.0, ge=0),
+    fields: Optional[str] = Query(default=None, description="Comma-separated response fields to return (e.g. response,done)"),
+):
+    job = await queue.wait(job_id, min(wait, settings.job_max_wait))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=502, detail=job.error)
+    if job.status != JobStatus.SUCCEEDED:
+        return JSONResponse(status_code=202, content=_job_view(job))
+
+    job = await queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return project_fields(job.result, fields)
@@ -1,26 +1,70 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-import requests
+from typing import Optional
+import httpx
 import asyncio
 
+from src.resilience import CircuitOpenError, DeadlineExceeded, call_upstream
+
 
 router = APIRouter()
 
 # Ollama API URL 설정
 OLLAMA_API_URL = "http://localhost:11434/api/generate"
+# 서킷 브레이커 이름
+OLLAMA_UPSTREAM = "ollama"
 
 # 요청 데이터 모델 정의
 class ChatRequest(BaseModel):
     prompt: str
 
-# Ollama API 호출 엔드포인트
-@router.post("/llm/")
-async def chat_with_llm(request: ChatRequest):
+
+def project_fields(body: dict, fields: Optional[str]) -> dict:
+    """
+    응답에서 요청한 필드만 남깁니다. (예: fields="response,done")
+    fields가 없으면 원본 그대로 반환, 요청한 필드가 하나도 없으면 400
+    """
+    if not fields:
+        return body
+    wanted = [f.strip() for f in fields.split(",") if f.strip()]
+    projected = {k: v for k, v in body.items() if k in wanted}
+    if not projected:
+        unknown = [f for f in wanted if f not in body]
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return projected
+
+
+async def generate(prompt: str) -> dict:
+    """
+    Ollama 생성 호출 (동기 엔드포인트와 작업 큐 워커에서 공용)
+    """
     payload = {
         "model": "qwen3:4b",
-        "prompt": request.prompt,
+        "prompt": prompt,
         "stream": False # 실시간 스트리밍 여부 (False: 일반응답)
     }
-    
-    response = requests.post(OLLAMA_API_URL, json=payload)
-    return response.json()
\ No newline at end of file
+
+    # 남은 요청 데드라인을 Ollama 호출 타임아웃으로 사용
+    async def post(timeout: float):
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            response = await client.post(OLLAMA_API_URL, json=payload)
+            response.raise_for_status()
+            return response.json()
+
+    return await call_upstream(OLLAMA_UPSTREAM, post)
+
+
+# Ollama API 호출 엔드포인트
+@router.post("/llm/")
+async def chat_with_llm(
+    request: ChatRequest,
+    fields: Optional[str] = Query(default=None, description="Comma-separated response fields to return (e.g. response,done)"),
+):
+    try:
+        return project_fields(await generate(request.prompt), fields)
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(int(e.retry_after) + 1)})
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Ollama error: {e}")
@@ -0,0 +1,148 @@
+"""
+응답 압축 ASGI 미들웨어 (FastAPI 앱 / MCP HTTP 전송 공용)
+
+- Accept-Encoding 협상 (gzip, deflate)
+- 한 번에 끝나는 응답은 minimum_size 이상일 때만 압축
+- HEAD 요청, 204/304 응답, 빈 본문은 압축하지 않음
+- 스트리밍 응답(SSE 등)은 청크마다 Z_SYNC_FLUSH 로 즉시 전달
+"""
+
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 인코딩별 zlib wbits (선호 순서)
+ENCODINGS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    "deflate": zlib.MAX_WBITS,
+}
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 인코딩 선택 (q=0 은 제외)"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name] = q
+
+    best = None
+    best_q = 0.0
+    for encoding in ENCODINGS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    content_type = content_type.lower()
+    return content_type.startswith("text/") or any(
+        t in content_type for t in ("json", "xml", "javascript")
+    )
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # HEAD 응답의 Content-Length 는 실제 본문 길이여야 하므로 압축하지 않음
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.minimum_size, self.compresslevel)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int, compresslevel: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, ENCODINGS[encoding])
+
+        self.start_message: Optional[Message] = None
+        self.started = False
+        self.passthrough = False
+
+    async def send(self, message: Message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # 첫 본문 청크를 보고 압축 여부를 결정하므로 헤더 전송을 미룸
+            self.start_message = message
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        if not self.started:
+            self.started = True
+            await self._start(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        await self._send_chunk(message.get("body", b""), message.get("more_body", False))
+
+    async def _start(self, message: Message):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if (
+            self.start_message["status"] in (204, 304)
+            or "content-encoding" in headers
+            or not _compressible(headers.get("content-type"))
+            or (not more_body and (not body or len(body) < self.minimum_size))
+        ):
+            self.passthrough = True
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body:
+            # 스트리밍: 전체 길이를 알 수 없음
+            if "content-length" in headers:
+                del headers["content-length"]
+            await self._send(self.start_message)
+            await self._send_chunk(body, True)
+            return
+
+        compressed = self.compressor.compress(body) + self.compressor.flush()
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_chunk(self, body: bytes, more_body: bool):
+        data = self.compressor.compress(body)
+        # 스트리밍 중에는 청크마다 flush 해서 SSE 이벤트가 지연되지 않게 함
+        data += self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -69,6 +69,91 @@ class Settings(BaseSettings):
         description="External API key"
     )
 
+    # Resilience Settings
+    request_timeout: float = Field(
+        default=120.0,
+        gt=0,
+        description="Default per-request deadline budget in seconds (API)"
+    )
+    mcp_tool_timeout: float = Field(
+        default=30.0,
+        gt=0,
+        description="Per-call deadline budget in seconds (MCP tools)"
+    )
+    upstream_timeout: float = Field(
+        default=30.0,
+        gt=0,
+        description="Upstream timeout in seconds when no deadline is set"
+    )
+    breaker_failure_threshold: int = Field(
+        default=5,
+        ge=1,
+        description="Consecutive failures before a circuit breaker opens"
+    )
+    breaker_recovery_timeout: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds an open circuit waits before half-open probing"
+    )
+    hedge_delay: float = Field(
+        default=2.0,
+        gt=0,
+        description="Delay in seconds before sending a hedged request (idempotent reads only)"
+    )
+
+    # LLM Job Queue Settings
+    job_store: str = Field(
+        default="memory",
+        pattern="^(memory|disk)$",
+        description="LLM job result store"
+    )
+    job_store_dir: str = Field(
+        default=".jobs",
+        description="Directory for the disk job store"
+    )
+    job_workers: int = Field(
+        default=2,
+        ge=1,
+        description="Maximum number of LLM jobs processed concurrently"
+    )
+    job_max_attempts: int = Field(
+        default=3,
+        ge=1,
+        description="Maximum attempts per LLM job (at-least-once retry)"
+    )
+    job_timeout: float = Field(
+        default=600.0,
+        gt=0,
+        description="Deadline budget in seconds for a single job attempt"
+    )
+    job_ttl: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Seconds a finished job is kept before eviction"
+    )
+    job_max_wait: float = Field(
+        default=60.0,
+        ge=0,
+        description="Maximum long-poll wait in seconds"
+    )
+
+    # Compression Settings
+    compression_enabled: bool = Field(
+        default=True,
+        description="Enable negotiated response compression (API and MCP HTTP transports)"
+    )
+    compression_min_size: int = Field(
+        default=500,
+        ge=1,
+        description="Minimum body size in bytes before a non-streaming response is compressed"
+    )
+    compression_level: int = Field(
+        default=6,
+        ge=1,
+        le=9,
+        description="zlib compression level"
+    )
+
     # CORS Settings
     cors_origins: str = Field(
         default="http://localhost:3000,http://localhost:8080",
@@ -0,0 +1,377 @@
+"""
+비동기 작업 큐
+
+- 작업 제출 즉시 job ID 반환, 워커 풀(동시 실행 수 제한)이 처리
+- 결과 저장소: 메모리 또는 로컬 디스크 (TTL 만료 시 삭제)
+- 워커 장애 시 at-least-once 재시도 (lease 만료 / 서버 재시작 시 재큐잉)
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from src.resilience import CircuitBreaker, CircuitOpenError, deadline_scope, is_client_error
+
+logger = logging.getLogger(__name__)
+
+# 만료 작업 정리 / lease 점검 주기 (초)
+MAINTENANCE_INTERVAL = 5.0
+# 작업 타임아웃 이후 워커 장애로 간주하기까지의 여유 시간 (초)
+LEASE_MARGIN = 30.0
+# 재시도 대기 시간 기본값 (초, 시도 횟수에 비례)
+RETRY_BACKOFF = 2.0
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    id: str
+    prompt: str
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    lease_expires_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+# -------------------------------------------------------
+# 결과 저장소
+# -------------------------------------------------------
+class MemoryJobStore:
+    """프로세스 메모리 저장소 (재시작 시 작업 유실)"""
+
+    # 호출이 블로킹 I/O 인지 여부 (True 면 JobQueue 가 스레드에서 호출)
+    blocking = False
+
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+
+    def save(self, job: Job):
+        self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def delete(self, job_id: str):
+        self._jobs.pop(job_id, None)
+
+    def all(self) -> List[Job]:
+        return list(self._jobs.values())
+
+
+class DiskJobStore:
+    """작업당 JSON 파일 하나를 쓰는 로컬 디스크 저장소 (재시작 후 복구 가능)"""
+
+    blocking = True
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, job_id: str) -> Path:
+        # job ID는 uuid4 hex만 허용 (경로 조작 방지)
+        if len(job_id) != 32 or not all(c in "0123456789abcdef" for c in job_id):
+            raise KeyError(job_id)
+        return self.directory / f"{job_id}.json"
+
+    def save(self, job: Job):
+        path = self._path(job.id)
+        # 같은 작업을 동시에 저장해도 임시 파일이 겹치지 않도록 고유 이름 사용
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp.write_text(job.model_dump_json(), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        try:
+            return Job.model_validate_json(self._path(job_id).read_text(encoding="utf-8"))
+        except (KeyError, FileNotFoundError):
+            return None
+
+    def delete(self, job_id: str):
+        try:
+            self._path(job_id).unlink(missing_ok=True)
+        except KeyError:
+            pass
+
+    def all(self) -> List[Job]:
+        jobs = []
+        for path in self.directory.glob("*.json"):
+            try:
+                jobs.append(Job.model_validate_json(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                logger.warning("skipping unreadable job file: %s", path)
+        return jobs
+
+
+# -------------------------------------------------------
+# 작업 큐
+# -------------------------------------------------------
+JobHandler = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+class JobQueue:
+    def __init__(
+        self,
+        store,
+        handler: JobHandler,
+        workers: int,
+        max_attempts: int,
+        job_timeout: float,
+        ttl: float,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.job_timeout = job_timeout
+        self.ttl = ttl
+        # 핸들러가 호출하는 업스트림의 브레이커. 열려 있으면 작업을 꺼내지 않고 대기
+        self.breaker = breaker
+
+        self._queue: Optional[asyncio.Queue] = None
+        # 작업 상태/시각 인덱스 (prompt/result 제외). stats/정리 작업이 저장소를 스캔하지 않도록 함
+        self._index: Dict[str, Job] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        # 재시도 대기 중인 작업 (backoff 후 큐에 들어감)
+        self._retry_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """워커 풀 시작. 저장소에 남은 미완료 작업은 다시 큐에 넣음"""
+        self._queue = asyncio.Queue()
+
+        # 저장소 전체 읽기는 시작 시 한 번만 수행
+        jobs = await self._io(self.store.all)
+        for job in sorted(jobs, key=lambda j: j.created_at):
+            if job.finished:
+                self._index[job.id] = self._summary(job)
+            else:
+                await self._requeue(job, "recovered after restart")
+
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._maintenance()))
+
+    async def stop(self):
+        for handle in self._retry_handles.values():
+            handle.cancel()
+        self._retry_handles = {}
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, prompt: str) -> Job:
+        job = Job(id=uuid.uuid4().hex, prompt=prompt, created_at=time.time())
+        await self._save(job)
+        self._queue.put_nowait(job.id)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """prompt/result 를 포함한 전체 작업 (저장소에서 읽음)"""
+        return await self._io(self.store.get, job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Job]:
+        """
+        작업이 끝나거나 timeout이 지날 때까지 대기 (long-poll)
+        인덱스의 상태만 반환하므로 prompt/result 가 필요하면 get() 사용
+        """
+        job = self._index.get(job_id)
+        if job is None or job.finished or timeout <= 0:
+            return job
+
+        event = self._events.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._index.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 길이와 작업 대기/실행 시간 (모니터링용)"""
+        now = time.time()
+        counts = {status.value: 0 for status in JobStatus}
+        oldest_queued = None
+        oldest_running = None
+
+        for job in self._index.values():
+            counts[job.status.value] += 1
+            if job.status == JobStatus.QUEUED:
+                oldest_queued = min(oldest_queued or job.created_at, job.created_at)
+            elif job.status == JobStatus.RUNNING and job.started_at is not None:
+                oldest_running = min(oldest_running or job.started_at, job.started_at)
+
+        return {
+            # 대기 중인 작업 전체 (큐에 있는 작업 + 재시도 대기 작업)
+            "queue_length": counts[JobStatus.QUEUED.value],
+            "retry_pending": len(self._retry_handles),
+            "workers": self.workers,
+            "jobs": counts,
+            "oldest_queued_age": now - oldest_queued if oldest_queued else 0.0,
+            "oldest_running_age": now - oldest_running if oldest_running else 0.0,
+        }
+
+    # ---------------------------------------------------
+    # 내부 처리
+    # ---------------------------------------------------
+    @staticmethod
+    def _summary(job: Job) -> Job:
+        return job.model_copy(update={"prompt": "", "result": None})
+
+    async def _io(self, func, *args):
+        # 디스크 저장소 호출은 이벤트 루프를 막지 않도록 스레드에서 실행
+        if self.store.blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def _save(self, job: Job):
+        self._index[job.id] = self._summary(job)
+        await self._io(self.store.save, job)
+
+    async def _delete(self, job_id: str):
+        self._index.pop(job_id, None)
+        await self._io(self.store.delete, job_id)
+
+    async def _requeue(self, job: Job, reason: str, delay: float = 0.0):
+        if job.attempts >= self.max_attempts:
+            await self._finish(job, JobStatus.FAILED, error=job.error or reason)
+            return
+
+        logger.info("requeue job %s (attempt %d): %s", job.id, job.attempts, reason)
+        job.status = JobStatus.QUEUED
+        job.lease_expires_at = None
+        await self._save(job)
+
+        if delay > 0:
+            previous = self._retry_handles.pop(job.id, None)
+            if previous is not None:
+                previous.cancel()
+            self._retry_handles[job.id] = asyncio.get_running_loop().call_later(
+                delay, self._enqueue_retry, job.id
+            )
+        else:
+            self._queue.put_nowait(job.id)
+
+    def _enqueue_retry(self, job_id: str):
+        self._retry_handles.pop(job_id, None)
+        self._queue.put_nowait(job_id)
+
+    async def _defer(self, job: Job, reason: str, retry_after: float):
+        """
+        업스트림 차단 중: 시도 횟수를 소모하지 않고 브레이커 복구 후 재시도
+        제출 후 ttl 이 지나도록 차단이 풀리지 않으면 실패 처리
+        """
+        if time.time() - job.created_at > self.ttl:
+            await self._finish(job, JobStatus.FAILED, error=job.error or reason)
+            return
+        await self._requeue(job, reason, delay=max(retry_after, RETRY_BACKOFF))
+
+    async def _finish(self, job: Job, status: JobStatus, result=None, error: Optional[str] = None):
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job.lease_expires_at = None
+        await self._save(job)
+
+        event = self._events.pop(job.id, None)
+        if event is not None:
+            event.set()
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # 처리 중 예기치 못한 오류: 작업은 RUNNING으로 남고 lease 만료 시 재시도됨
+                logger.exception("job worker %d crashed on job %s", index, job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        # 삭제되었거나 이미 다른 워커가 가져간 작업
+        summary = self._index.get(job_id)
+        if summary is None or summary.status != JobStatus.QUEUED:
+            return
+
+        job = await self.get(job_id)
+        if job is None:
+            self._index.pop(job_id, None)
+            return
+
+        if self.breaker is not None:
+            retry_after = self.breaker.retry_after()
+            if retry_after is not None:
+                await self._defer(job, f"circuit '{self.breaker.name}' is open", retry_after)
+                return
+
+        now = time.time()
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.started_at = now
+        job.lease_expires_at = now + self.job_timeout + LEASE_MARGIN
+        await self._save(job)
+
+        try:
+            with deadline_scope(self.job_timeout):
+                result = await self.handler(job.prompt)
+        except CircuitOpenError as e:
+            job.attempts -= 1
+            await self._defer(job, str(e), e.retry_after)
+            return
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            if is_client_error(e):
+                # 4xx: 재시도해도 결과가 같으므로 즉시 실패 처리
+                await self._finish(job, JobStatus.FAILED, error=job.error)
+            else:
+                await self._requeue(job, job.error, delay=RETRY_BACKOFF * job.attempts)
+            return
+
+        await self._finish(job, JobStatus.SUCCEEDED, result=result)
+
+    async def _maintenance(self):
+        while True:
+            await asyncio.sleep(MAINTENANCE_INTERVAL)
+            try:
+                await self._sweep()
+            except Exception:
+                logger.exception("job maintenance failed")
+
+    async def _sweep(self):
+        now = time.time()
+        for summary in list(self._index.values()):
+            if summary.finished:
+                # TTL 만료된 결과 삭제
+                if summary.finished_at is not None and now - summary.finished_at > self.ttl:
+                    await self._delete(summary.id)
+            elif summary.status == JobStatus.RUNNING and summary.lease_expires_at and summary.lease_expires_at < now:
+                # lease 만료: 워커 장애로 보고 재시도
+                job = await self.get(summary.id)
+                if job is None:
+                    self._index.pop(summary.id, None)
+                else:
+                    await self._requeue(job, "lease expired")
@@ -6,6 +6,9 @@ from mcp.server.fastmcp import FastMCP
 import httpx
 from bs4 import BeautifulSoup
 
+from src.config import settings
+from src.resilience import CircuitOpenError, DeadlineExceeded, call_upstream, deadline_scope
+
 # 영문 별자리 슬러그
 VALID_SIGNS = [
     "aries", "taurus", "gemini", "cancer",
@@ -59,13 +62,24 @@ def create_Astrology_mcp_server() -> FastMCP:
         # 한글 별자리 → 슬러그 변환
         if slug in KOR_TO_SLUG: slug = KOR_TO_SLUG[slug]
 
+        if slug not in VALID_SIGNS:
+            return f"Error: 알 수 없는 별자리입니다: '{sign}'"
+
         base_url = "https://www.astrolutely.com/forecasts/"
         url = f"{base_url}{slug}/"
 
-        # 1) HTTP 요청
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        # 1) HTTP 요청 (멱등 GET → 헤지 요청 허용)
+        async def fetch(timeout: float):
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.get(url)
+                response.raise_for_status()
+                return response
+
+        try:
+            with deadline_scope(settings.mcp_tool_timeout):
+                response = await call_upstream("astrolutely", fetch, hedge_delay=settings.hedge_delay)
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            return f"Error: {str(e)}"
 
         # 2) HTML 파싱
         soup = BeautifulSoup(response.text, "html.parser")
@@ -4,6 +4,9 @@ from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 from mcp.server.fastmcp import FastMCP
 
+from src.config import settings
+from src.resilience import call_upstream, deadline_scope
+
 
 # Smithery 인증 정보 (환경변수 또는 직접 입력)
 SMITHERY_API_KEY = os.getenv("SMITHERY_API_KEY", "YOUR_API_KEY_HERE")
@@ -32,29 +35,34 @@ def create_smithery_mcp_server() -> FastMCP:
         Returns:
             str: Available tools list
         """
-        try:
+        # Idempotent read: hedged requests are allowed
+        async def fetch_tools(timeout: float):
             # Connect to the server using HTTP client
-            async with streamablehttp_client(url) as (read, write, _):
+            async with streamablehttp_client(url, timeout=timeout, sse_read_timeout=timeout) as (read, write, _):
                 async with ClientSession(read, write) as session:
                     # Initialize the connection
                     await session.initialize()
-                    
+
                     # List available tools
-                    tools_result = await session.list_tools()
-                    
-                    tools_list = [f"Available tools: {', '.join([t.name for t in tools_result.tools])}"]
-                    tools_list.append("\n=== Tool Details ===\n")
-                    
-                    for tool in tools_result.tools:
-                        tools_list.append(f"• {tool.name}")
-                        if hasattr(tool, 'description') and tool.description:
-                            tools_list.append(f"  {tool.description}")
-                        if hasattr(tool, 'inputSchema'):
-                            tools_list.append(f"  Parameters: {tool.inputSchema}")
-                        tools_list.append("")
-                    
-                    return "\n".join(tools_list)
-                    
+                    return await session.list_tools()
+
+        try:
+            with deadline_scope(settings.mcp_tool_timeout):
+                tools_result = await call_upstream("smithery", fetch_tools, hedge_delay=settings.hedge_delay)
+
+            tools_list = [f"Available tools: {', '.join([t.name for t in tools_result.tools])}"]
+            tools_list.append("\n=== Tool Details ===\n")
+
+            for tool in tools_result.tools:
+                tools_list.append(f"• {tool.name}")
+                if hasattr(tool, 'description') and tool.description:
+                    tools_list.append(f"  {tool.description}")
+                if hasattr(tool, 'inputSchema'):
+                    tools_list.append(f"  Parameters: {tool.inputSchema}")
+                tools_list.append("")
+
+            return "\n".join(tools_list)
+
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -70,25 +78,30 @@ def create_smithery_mcp_server() -> FastMCP:
         Returns:
             str: Tool execution result
         """
-        try:
+        # Tool calls may have side effects: no hedging
+        async def invoke(timeout: float):
             # Connect to the server using HTTP client
-            async with streamablehttp_client(url) as (read, write, _):
+            async with streamablehttp_client(url, timeout=timeout, sse_read_timeout=timeout) as (read, write, _):
                 async with ClientSession(read, write) as session:
                     # Initialize the connection
                     await session.initialize()
-                    
+
                     # Call the tool
-                    result = await session.call_tool(tool_name, arguments=kwargs)
-                    
-                    # Format the result
-                    if result.content:
-                        return "\n".join([
-                            str(item.text) if hasattr(item, 'text') else str(item)
-                            for item in result.content
-                        ])
-                    else:
-                        return "No content returned from tool"
-                    
+                    return await session.call_tool(tool_name, arguments=kwargs)
+
+        try:
+            with deadline_scope(settings.mcp_tool_timeout):
+                result = await call_upstream("smithery", invoke)
+
+            # Format the result
+            if result.content:
+                return "\n".join([
+                    str(item.text) if hasattr(item, 'text') else str(item)
+                    for item in result.content
+                ])
+            else:
+                return "No content returned from tool"
+
         except Exception as e:
             return f"Error: {str(e)}"
 
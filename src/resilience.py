@@ -0,0 +1,321 @@
+"""
+업스트림 호출 공통 복원력(resilience) 레이어
+
+- 요청 단위 데드라인 예산: contextvar로 하위 호출까지 전달
+- 업스트림별 서킷 브레이커 (closed → open → half_open 프로빙)
+- 멱등 읽기 요청용 헤지(hedged) 요청
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 현재 요청의 데드라인 (time.monotonic() 기준 절대 시각)
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+# 현재 데드라인을 정한 scope 의 예산(초). 업스트림 타임아웃의 책임 판단에 사용
+_budget: ContextVar[Optional[float]] = ContextVar("budget", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """요청 데드라인 예산이 모두 소진됨"""
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 업스트림 호출이 차단됨"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open (retry after {retry_after:.1f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+# -------------------------------------------------------
+# 데드라인
+# -------------------------------------------------------
+@contextmanager
+def deadline_scope(seconds: float):
+    """
+    현재 컨텍스트에 데드라인을 설정합니다.
+    이미 더 짧은 데드라인이 있으면 그 값을 유지합니다.
+    """
+    new_deadline = time.monotonic() + seconds
+    new_budget = seconds
+    current = _deadline.get()
+    if current is not None and current < new_deadline:
+        new_deadline = current
+        new_budget = _budget.get()
+
+    token = _deadline.set(new_deadline)
+    budget_token = _budget.set(new_budget)
+    try:
+        yield new_deadline
+    finally:
+        _budget.reset(budget_token)
+        _deadline.reset(token)
+
+
+def remaining_time(default: Optional[float] = None) -> float:
+    """
+    남은 데드라인 예산(초)을 반환합니다.
+    데드라인이 없으면 default(없으면 settings.upstream_timeout)를 사용합니다.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return default if default is not None else settings.upstream_timeout
+
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return remaining
+
+
+# -------------------------------------------------------
+# 서킷 브레이커
+# -------------------------------------------------------
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._total_failures = 0
+        self._total_successes = 0
+        self._total_rejected = 0
+        # API 서버(스레드)와 MCP 서버(메인 루프)가 같은 브레이커를 공유할 수 있음
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(self.HALF_OPEN)
+            self._half_open_calls = 0
+
+    def _transition(self, state: str):
+        if self._state != state:
+            logger.warning("circuit '%s': %s -> %s", self.name, self._state, state)
+            self._state = state
+
+    def before_call(self):
+        """호출 허용 여부 확인. 허용되지 않으면 CircuitOpenError 발생"""
+        with self._lock:
+            self._maybe_half_open()
+
+            if self._state == self.OPEN:
+                self._total_rejected += 1
+                retry_after = self.recovery_timeout - (time.monotonic() - self._opened_at)
+                raise CircuitOpenError(self.name, max(retry_after, 0.0))
+
+            if self._state == self.HALF_OPEN:
+                # half-open 상태에서는 제한된 수의 프로브만 통과
+                if self._half_open_calls >= self.half_open_max_calls:
+                    self._total_rejected += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._half_open_calls += 1
+
+    def retry_after(self) -> Optional[float]:
+        """
+        호출이 차단될 상태면 다시 시도할 때까지 남은 시간(초), 아니면 None
+        (before_call 과 달리 rejected 로 집계하지 않음)
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.OPEN:
+                return max(self.recovery_timeout - (time.monotonic() - self._opened_at), 0.0)
+            if self._state == self.HALF_OPEN and self._half_open_calls >= self.half_open_max_calls:
+                return 0.0
+            return None
+
+    def release(self):
+        """결과 없이 끝난(취소된) 호출의 half-open 프로브 슬롯 반환"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self):
+        with self._lock:
+            self._total_successes += 1
+            self._failures = 0
+            if self._state == self.HALF_OPEN:
+                self._transition(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._total_failures += 1
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self._transition(self.OPEN)
+        self._opened_at = time.monotonic()
+        self._failures = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._maybe_half_open()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "total_successes": self._total_successes,
+                "total_failures": self._total_failures,
+                "total_rejected": self._total_rejected,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """업스트림 이름별 서킷 브레이커 (없으면 생성)"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=settings.breaker_failure_threshold,
+                recovery_timeout=settings.breaker_recovery_timeout,
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """모든 서킷 브레이커 상태 (모니터링용)"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+
+# -------------------------------------------------------
+# 업스트림 호출
+# -------------------------------------------------------
+UpstreamCall = Callable[[float], Awaitable[Any]]
+
+
+async def _hedged(func: UpstreamCall, timeout: float, hedge_delay: float) -> Any:
+    """
+    첫 요청이 hedge_delay 안에 끝나지 않으면 같은 요청을 한 번 더 보내고
+    먼저 성공한 결과를 사용합니다. (멱등 읽기 전용)
+    """
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+
+    tasks = [asyncio.ensure_future(func(timeout))]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=min(hedge_delay, timeout))
+        if not done and end - loop.time() > 0:
+            tasks.append(asyncio.ensure_future(func(end - loop.time())))
+
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            left = end - loop.time()
+            if left <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=left, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+
+        if error is not None and not pending:
+            raise error
+        raise DeadlineExceeded("Request deadline exceeded")
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def is_client_error(exc: BaseException) -> bool:
+    """호출자 책임인 4xx 응답인지 확인 (408/429 는 업스트림 상태 문제로 간주)"""
+    return (
+        isinstance(exc, httpx.HTTPStatusError)
+        and 400 <= exc.response.status_code < 500
+        and exc.response.status_code not in (408, 429)
+    )
+
+
+async def call_upstream(
+    name: str,
+    func: UpstreamCall,
+    hedge_delay: Optional[float] = None,
+) -> Any:
+    """
+    서킷 브레이커와 데드라인을 적용해 업스트림을 호출합니다.
+
+    Args:
+        name: 업스트림 이름 (브레이커 키)
+        func: 남은 타임아웃(초)을 받아 업스트림을 호출하는 코루틴 함수
+        hedge_delay: 지정하면 헤지 요청 사용 (멱등 읽기에만 사용)
+    """
+    breaker = get_breaker(name)
+    timeout = remaining_time()
+    breaker.before_call()
+
+    try:
+        # half-open 프로브는 한 번만 보내도록 헤지하지 않음
+        if hedge_delay is not None and breaker.state == CircuitBreaker.CLOSED:
+            result = await _hedged(func, timeout, hedge_delay)
+        else:
+            result = await asyncio.wait_for(func(timeout), timeout)
+    except (asyncio.TimeoutError, DeadlineExceeded, httpx.TimeoutException):
+        # 호출자가 기본값보다 짧은 예산을 준 경우는 업스트림 책임이 아니므로 집계하지 않음
+        budget = _budget.get()
+        if budget is not None and budget < settings.upstream_timeout:
+            breaker.release()
+        else:
+            breaker.record_failure()
+        raise DeadlineExceeded(f"Upstream '{name}' timed out after {timeout:.1f}s")
+    except asyncio.CancelledError:
+        breaker.release()
+        raise
+    except Exception as e:
+        if is_client_error(e):
+            # 4xx: 업스트림은 정상 응답함 (잘못된 요청)
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        raise
+
+    breaker.record_success()
+    return result
@@ -0,0 +1,110 @@
+import asyncio
+import gzip
+import zlib
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.compression import CompressionMiddleware, negotiate_encoding
+
+BIG = "x" * 2000
+
+
+async def big(request):
+    return PlainTextResponse(BIG)
+
+
+async def small(request):
+    return JSONResponse({"ok": True})
+
+
+async def empty(request):
+    return Response(status_code=204)
+
+
+async def not_modified(request):
+    return Response(status_code=304, media_type="text/plain")
+
+
+def make_client(minimum_size=0):
+    app = Starlette(routes=[
+        Route("/big", big, methods=["GET", "HEAD"]),
+        Route("/small", small),
+        Route("/empty", empty),
+        Route("/not-modified", not_modified),
+    ])
+    return TestClient(CompressionMiddleware(app, minimum_size=minimum_size))
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("deflate, gzip;q=0") == "deflate"
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding("*") == "gzip"
+
+
+def test_large_body_is_compressed():
+    response = make_client(minimum_size=500).get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == BIG
+
+
+def test_body_below_threshold_is_not_compressed():
+    response = make_client(minimum_size=500).get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
+
+
+def test_no_content_and_not_modified_are_not_compressed():
+    client = make_client()
+
+    for path in ("/empty", "/not-modified"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.content == b""
+
+
+def test_head_is_not_compressed():
+    response = make_client().head("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(len(BIG))
+
+
+def test_stream_chunks_are_flushed_individually():
+    events = [b"data: one\n\n", b"data: two\n\n", b"data: three\n\n"]
+
+    async def stream():
+        for event in events:
+            yield event
+
+    async def sse_app(scope, receive, send):
+        await StreamingResponse(stream(), media_type="text/event-stream")(scope, receive, send)
+
+    messages = []
+
+    async def receive():
+        # 클라이언트 연결 유지 (응답이 끝나면 StreamingResponse 가 취소함)
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(sse_app)(scope, receive, send))
+
+    start = messages[0]
+    assert (b"content-encoding", b"gzip") in start["headers"]
+
+    # 각 청크는 받은 즉시 해당 이벤트로 완전히 풀려야 함 (버퍼링 없음)
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    bodies = [m for m in messages[1:] if m["type"] == "http.response.body"]
+    decoded = [decompressor.decompress(m["body"]) for m in bodies]
+    assert decoded[:len(events)] == events
+    assert b"".join(decoded) == b"".join(events)
+    assert gzip.decompress(b"".join(m["body"] for m in bodies)) == b"".join(events)
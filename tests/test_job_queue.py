@@ -0,0 +1,170 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src import job_queue, resilience
+from src.config import settings
+from src.job_queue import DiskJobStore, JobQueue, JobStatus, MemoryJobStore
+from src.resilience import call_upstream, get_breaker
+
+
+@pytest.fixture(autouse=True)
+def fast_settings(monkeypatch):
+    monkeypatch.setattr(settings, "breaker_failure_threshold", 1)
+    monkeypatch.setattr(settings, "breaker_recovery_timeout", 0.1)
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(job_queue, "RETRY_BACKOFF", 0.01)
+
+
+def make_queue(handler, store=None, ttl=60.0, breaker=None):
+    return JobQueue(
+        store if store is not None else MemoryJobStore(),
+        handler=handler,
+        workers=2,
+        max_attempts=3,
+        job_timeout=5.0,
+        ttl=ttl,
+        breaker=breaker,
+    )
+
+
+async def upstream_ok(timeout):
+    return {"response": "ok"}
+
+
+def open_breaker(name):
+    breaker = get_breaker(name)
+    for _ in range(settings.breaker_failure_threshold):
+        breaker.record_failure()
+    return breaker
+
+
+def test_job_waits_for_open_breaker_without_using_attempts():
+    breaker = open_breaker("upstream")
+
+    async def handler(prompt):
+        return await call_upstream("upstream", upstream_ok)
+
+    async def main():
+        queue = make_queue(handler, breaker=breaker)
+        await queue.start()
+        try:
+            job = await queue.submit("hi")
+            return await queue.wait(job.id, 2.0)
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(main())
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.attempts == 1
+    # 큐 내부 대기는 브레이커 거부 횟수에 포함되지 않음
+    assert breaker.snapshot()["total_rejected"] == 0
+
+
+def test_job_fails_when_breaker_stays_open_past_ttl():
+    async def handler(prompt):
+        raise resilience.CircuitOpenError("down", 0.0)
+
+    async def main():
+        queue = make_queue(handler, ttl=0.1)
+        await queue.start()
+        try:
+            job = await queue.submit("hi")
+            return await queue.wait(job.id, 2.0)
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(main())
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 0
+
+
+def test_client_error_fails_job_immediately():
+    async def handler(prompt):
+        request = httpx.Request("POST", "http://upstream")
+        raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+
+    async def main():
+        queue = make_queue(handler)
+        await queue.start()
+        try:
+            job = await queue.submit("hi")
+            return await queue.wait(job.id, 2.0)
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(main())
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 1
+
+
+def test_unfinished_disk_jobs_are_recovered(tmp_path):
+    store = DiskJobStore(str(tmp_path))
+    store.save(job_queue.Job(id="a" * 32, prompt="x", created_at=1.0, status=JobStatus.RUNNING, attempts=1))
+
+    async def handler(prompt):
+        return {"response": prompt}
+
+    async def main():
+        queue = make_queue(handler, store=store)
+        await queue.start()
+        try:
+            return await queue.wait("a" * 32, 2.0)
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(main())
+    assert job.status == JobStatus.SUCCEEDED
+    assert store.get("a" * 32).result == {"response": "x"}
+
+
+def test_disk_store_round_trip_keeps_result_out_of_index(tmp_path):
+    store = DiskJobStore(str(tmp_path))
+
+    async def handler(prompt):
+        return {"response": prompt.upper()}
+
+    async def main():
+        queue = make_queue(handler, store=store)
+        await queue.start()
+        try:
+            job = await queue.submit("hi")
+            summary = await queue.wait(job.id, 2.0)
+            return summary, await queue.get(job.id)
+        finally:
+            await queue.stop()
+
+    summary, job = asyncio.run(main())
+    assert summary.status == JobStatus.SUCCEEDED
+    assert summary.result is None
+    assert job.prompt == "hi"
+    assert job.result == {"response": "HI"}
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_stats_count_jobs_waiting_for_retry(monkeypatch):
+    monkeypatch.setattr(job_queue, "RETRY_BACKOFF", 60.0)
+
+    async def handler(prompt):
+        raise httpx.ConnectError("refused")
+
+    async def main():
+        queue = make_queue(handler)
+        await queue.start()
+        try:
+            await queue.submit("hi")
+            for _ in range(100):
+                stats = queue.stats()
+                if stats["retry_pending"]:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await queue.stop()
+        return stats, queue
+
+    stats, queue = asyncio.run(main())
+    assert stats["queue_length"] == 1
+    assert stats["retry_pending"] == 1
+    assert stats["jobs"]["queued"] == 1
+    assert queue._retry_handles == {}
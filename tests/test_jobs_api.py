@@ -0,0 +1,12 @@
+import asyncio
+
+from src.api import jobs
+
+
+def test_run_prompt_drops_context_before_storing(monkeypatch):
+    async def fake_generate(prompt):
+        return {"response": prompt, "done": True, "context": list(range(4096))}
+
+    monkeypatch.setattr(jobs, "generate", fake_generate)
+
+    assert asyncio.run(jobs.run_prompt("hi")) == {"response": "hi", "done": True}
@@ -0,0 +1,23 @@
+import pytest
+from fastapi import HTTPException
+
+from src.api.llm import project_fields
+
+BODY = {"model": "qwen3:4b", "response": "hi", "done": True, "context": [1, 2, 3]}
+
+
+def test_project_fields_without_fields_returns_body():
+    assert project_fields(BODY, None) == BODY
+
+
+def test_project_fields_keeps_requested_fields():
+    assert project_fields(BODY, "response, done") == {"response": "hi", "done": True}
+
+
+def test_project_fields_rejects_only_unknown_fields():
+    with pytest.raises(HTTPException) as exc_info:
+        project_fields(BODY, "respnse,dne")
+
+    assert exc_info.value.status_code == 400
+    assert "respnse" in exc_info.value.detail
+    assert "dne" in exc_info.value.detail
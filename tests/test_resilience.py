@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src import resilience
+from src.config import settings
+from src.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, call_upstream, deadline_scope
+
+
+@pytest.fixture(autouse=True)
+def fast_settings(monkeypatch):
+    monkeypatch.setattr(settings, "upstream_timeout", 0.1)
+    monkeypatch.setattr(settings, "mcp_tool_timeout", 0.1)
+    monkeypatch.setattr(settings, "breaker_failure_threshold", 3)
+    monkeypatch.setattr(settings, "breaker_recovery_timeout", 0.1)
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+
+async def hang(timeout):
+    await asyncio.sleep(10)
+
+
+def answer_after(delay):
+    async def call(timeout):
+        await asyncio.sleep(delay)
+        return "ok"
+    return call
+
+
+async def not_found(timeout):
+    request = httpx.Request("GET", "http://upstream")
+    raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+
+
+def test_hung_upstream_opens_breaker_under_default_mcp_budget():
+    async def main():
+        for _ in range(settings.breaker_failure_threshold):
+            with deadline_scope(settings.mcp_tool_timeout):
+                with pytest.raises(DeadlineExceeded):
+                    await call_upstream("hung", hang, hedge_delay=0.02)
+
+        with pytest.raises(CircuitOpenError):
+            await call_upstream("hung", hang)
+
+    asyncio.run(main())
+    assert resilience.breaker_states()["hung"]["state"] == CircuitBreaker.OPEN
+
+
+def test_short_caller_budget_does_not_count_as_upstream_failure():
+    async def main():
+        slow = answer_after(0.05)
+        for _ in range(settings.breaker_failure_threshold + 2):
+            with deadline_scope(0.01):
+                with pytest.raises(DeadlineExceeded):
+                    await call_upstream("slow", slow)
+        return await call_upstream("slow", slow)
+
+    assert asyncio.run(main()) == "ok"
+    state = resilience.breaker_states()["slow"]
+    assert state["state"] == CircuitBreaker.CLOSED
+    assert state["total_failures"] == 0
+
+
+def test_nested_longer_scope_keeps_outer_budget():
+    async def main():
+        with deadline_scope(0.01):
+            with deadline_scope(settings.mcp_tool_timeout):
+                with pytest.raises(DeadlineExceeded):
+                    await call_upstream("nested", hang)
+
+    asyncio.run(main())
+    assert resilience.breaker_states()["nested"]["total_failures"] == 0
+
+
+def test_client_errors_do_not_open_breaker():
+    async def main():
+        for _ in range(settings.breaker_failure_threshold + 2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await call_upstream("bad-input", not_found)
+
+    asyncio.run(main())
+    state = resilience.breaker_states()["bad-input"]
+    assert state["state"] == CircuitBreaker.CLOSED
+    assert state["total_failures"] == 0
+
+
+def test_half_open_probe_closes_breaker():
+    async def fail(timeout):
+        raise httpx.ConnectError("refused")
+
+    async def main():
+        for _ in range(settings.breaker_failure_threshold):
+            with pytest.raises(httpx.ConnectError):
+                await call_upstream("flaky", fail)
+        with pytest.raises(CircuitOpenError):
+            await call_upstream("flaky", fail)
+
+        await asyncio.sleep(settings.breaker_recovery_timeout)
+        return await call_upstream("flaky", answer_after(0))
+
+    assert asyncio.run(main()) == "ok"
+    assert resilience.breaker_states()["flaky"]["state"] == CircuitBreaker.CLOSED
+
+
+def test_hedged_request_returns_first_success():
+    calls = []
+
+    async def first_slow(timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+        return len(calls)
+
+    async def main():
+        with deadline_scope(1.0):
+            return await call_upstream("hedged", first_slow, hedge_delay=0.02)
+
+    assert asyncio.run(main()) == 2